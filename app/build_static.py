@@ -0,0 +1,103 @@
+"""
+静的ファイルのビルドスクリプト
+
+static/ 配下のアセット（JS, CSS）をコンテンツハッシュ付きのファイル名で static/dist/ にコピーし、
+gzip / brotli で事前圧縮する。あわせて index.html 内の参照をハッシュ付きURLに書き換えたものを build/ に出力する。
+（index.html と manifest.json はファイル名にハッシュを含まないため、長期キャッシュされる static/dist/ には置かない）
+
+使い方（app ディレクトリで実行）:
+    uv run python build_static.py
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import brotli
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+BUILD_DIR = os.path.join(APP_DIR, "build")
+INDEX_HTML = "index.html"
+MANIFEST_FILE = "manifest.json"
+
+# ハッシュ化・事前圧縮の対象とするアセット
+ASSETS = ["script.js", "style.css"]
+HASH_LENGTH = 10
+# hashed_name() が生成するファイル名（事前圧縮ファイルを含む）
+HASHED_NAME_PATTERN = re.compile(r"^[^/]+\.[0-9a-f]{%d}\.[^./]+(\.gz|\.br)?$" % HASH_LENGTH)
+
+# index.html 内の href="static/..." / src="static/..." を書き換え対象とする
+ASSET_REFERENCE_PATTERN = re.compile(r'(href|src)="static/([^"]+)"')
+
+
+def hashed_name(filename, content):
+    """
+    ファイル内容のハッシュを埋め込んだファイル名を返す（例: script.js -> script.0123456789.js）
+    """
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest}{ext}"
+
+
+def write_precompressed(path, content):
+    """
+    gzip（.gz）と brotli（.br）で事前圧縮したファイルを書き出す
+    """
+    # mtime=0 にしてビルド結果を再現可能にする
+    with open(f"{path}.gz", "wb") as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+
+    with open(f"{path}.br", "wb") as f:
+        f.write(brotli.compress(content, quality=11))
+
+
+def build(static_dir=STATIC_DIR, dist_dir=DIST_DIR, build_dir=BUILD_DIR):
+    """
+    アセットをビルドし、元のファイル名 -> ハッシュ付きファイル名 のマニフェストを返す
+    """
+    # 古いハッシュのファイルが残らないよう毎回作り直す
+    for output_dir in (dist_dir, build_dir):
+        if os.path.isdir(output_dir):
+            shutil.rmtree(output_dir)
+        os.makedirs(output_dir)
+
+    manifest = {}
+    for filename in ASSETS:
+        with open(os.path.join(static_dir, filename), "rb") as f:
+            content = f.read()
+
+        output_name = hashed_name(filename, content)
+        output_path = os.path.join(dist_dir, output_name)
+        with open(output_path, "wb") as f:
+            f.write(content)
+        write_precompressed(output_path, content)
+        manifest[filename] = output_name
+
+    # index.html の参照をハッシュ付きURLに書き換える
+    with open(os.path.join(static_dir, INDEX_HTML), encoding="utf-8") as f:
+        index_html = f.read()
+
+    def replace_reference(match):
+        attr, filename = match.groups()
+        if filename not in manifest:
+            return match.group(0)
+        return f'{attr}="static/dist/{manifest[filename]}"'
+
+    with open(os.path.join(build_dir, INDEX_HTML), "w", encoding="utf-8") as f:
+        f.write(ASSET_REFERENCE_PATTERN.sub(replace_reference, index_html))
+
+    with open(os.path.join(build_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    manifest = build()
+    for source, output in manifest.items():
+        print(f"{source} -> static/dist/{output}")
+    print(f"index.html -> build/{INDEX_HTML}")
@@ -1,24 +1,65 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 import random
 import asyncio
 import os
+from contextlib import aclosing
 
-from models import CreateThreadRequest, Thread, ThreadPost, CreatePostRequest, ThreadStatus
+from models import CreateThreadRequest, Thread, ThreadPost, CreatePostRequest, ThreadStatus, ThreadPostPage
 from services.firestore_service import db
 from google.cloud import firestore
 
 
 # AI関連のインポート
 from services.gemini_service import geminiApiCaller, geminiApiCallerWithTool
-from services.prompt import NANASHI_BASE_PROMPT, KAISUTSU_NIKI_PROMPT, NANASHI_REP_PROMPT, NANASHI_MULTI_PROMPT, NANASHI_MULTI_SYSTEM_INSTRUCTION
-from services.json_schema import KAISUTSU_NIKI_SCHEMA, NANASHI_MULTI_RESPONSE_SCHEMA
+from services.prompt import NANASHI_BASE_PROMPT, KAISUTSU_NIKI_PROMPT, NANASHI_REP_PROMPT
+from services.json_schema import KAISUTSU_NIKI_SCHEMA
+from services.nanashi_service import (
+    NANASHI_GENERATION_MODE, NANASHI_FALLBACK_MESSAGES,
+    build_thread_history, generate_nanashi_replies_single, iter_nanashi_replies_parallel,
+)
 
 router = APIRouter()
 GCP_FIRESTORE_DB_NAME=os.getenv("GCP_FIRESTORE_DB_NAME")
+# 投稿取得APIで1ページに返す最大件数
+MAX_POSTS_PAGE_SIZE = 200
 
 # --- バックグラウンドタスク: AIレスポンス生成 ---
+@firestore.async_transactional
+async def _append_posts_in_transaction(transaction, thread_ref, new_posts):
+    snapshot = await thread_ref.get(transaction=transaction)
+    if not snapshot.exists:
+        return None
+
+    thread_data = snapshot.to_dict()
+    current_post_count = len(thread_data.get("posts", []))
+    
+    # 最終的な書き込みデータを作成（post_idなどを付与）
+    final_posts_data = []
+    for i, post_content in enumerate(new_posts):
+        final_post = {
+            "post_id": current_post_count + i + 1,
+            "author": post_content["author"],
+            "message": post_content["message"],
+            "created_at": datetime.now()
+        }
+        final_posts_data.append(final_post)
+    
+    # 1回のupdateで全ての投稿をまとめて追加
+    transaction.update(thread_ref, {
+        "posts": firestore.ArrayUnion(final_posts_data),
+        "updated_at": firestore.SERVER_TIMESTAMP
+    })
+    return final_posts_data
+
+async def append_posts(db, thread_ref, new_posts):
+    """
+    投稿をスレッドに追加し、書き込んだ投稿データのリストを返す。スレッドが存在しない場合はNoneを返す。
+    post_idの採番と追加をトランザクションで行うため、AIの書き込みとイッチの投稿が同時に起きてもpost_idは重複しない
+    """
+    return await _append_posts_in_transaction(db.transaction(), thread_ref, new_posts)
+
 async def generate_ai_responses(thread_id: str, user_post_message: str, thread_title: str):
     """
     AIレスポンスを生成し、Firestoreに保存する
@@ -59,91 +100,39 @@ async def generate_ai_responses(thread_id: str, user_post_message: str, thread_t
                 ]
 
         else:
-            # --- 名無しさんの処理（単一API呼び出し） ---
-            num_responses = 3
-            # TODO: thinking_budgetは適切な値に調整
-            caller = geminiApiCaller(model_name="gemini-2.5-flash", response_schema=NANASHI_MULTI_RESPONSE_SCHEMA, thinking_budget=-1)
-            
             # 過去の投稿履歴を取得
             snapshot = await thread_ref.get()
             thread_data = snapshot.to_dict() if snapshot.exists else {}
-            posts = sorted(thread_data.get("posts", []), key=lambda p: p.get('post_id', 0))
-
-            if posts:
-                thread_history_lines = []
-                for post in posts:
-                    created_at = post.get('created_at')
-                    time_str = ""
-                    # Firestoreから取得したタイムスタンプはdatetimeオブジェクトの場合と、文字列の場合があるため両対応
-                    if isinstance(created_at, datetime):
-                        time_str = created_at.strftime('%Y-%m-%d %H:%M:%S')
-                    elif isinstance(created_at, str):
-                        # ISOフォーマットの文字列をパースする想定
-                        try:
-                            time_str = datetime.fromisoformat(created_at).strftime('%Y-%m-%d %H:%M:%S')
-                        except ValueError:
-                            time_str = created_at # パース失敗時は元の文字列をそのまま利用
-                    
-                    author = post.get('author', '不明')
-                    message = post.get('message', '')
-                    thread_history_lines.append(f"{author} ({time_str}): {message}")
-                thread_history = "\n".join(thread_history_lines)
-            else:
-                # 履歴が取得できない場合は、現在の投稿を履歴とする
-                # この場合、正確な時間は不明なため含めない
-                thread_history = f"イッチ: {user_post_message}"
-            
-            prompt = NANASHI_MULTI_PROMPT.format(
-                num_replies=num_responses,
-                thread_title=thread_title,
-                thread_history=thread_history, # 本来は完全な履歴
-                latest_post_content=user_post_message
-            )
-            print(prompt)
-            # システムインストラクションをプロンプトに含める
-            full_prompt = f"{NANASHI_MULTI_SYSTEM_INSTRUCTION.format(num_replies=num_responses)}\n\n{prompt}"
-
-            parsed_responses, error = await caller.atext2text(full_prompt)
-
-            if error or not parsed_responses:
-                # エラー時やレスポンスがない場合は固定の代替レスポンス
-                new_posts = [
-                    {"author": "名無しさん", "message": "せやな"},
-                    {"author": "名無しさん", "message": "草"},
-                    {"author": "名無しさん", "message": "なるほど"},
+            thread_history = build_thread_history(thread_data.get("posts", []), user_post_message)
+
+            if NANASHI_GENERATION_MODE == "parallel":
+                # --- 名無しさんの処理（ペルソナごとの並列API呼び出し） ---
+                # 生成できたレスから1件ずつ書き込み、失敗・タイムアウトしたペルソナは捨てる
+                written_count = 0
+                async with aclosing(iter_nanashi_replies_parallel(thread_title, thread_history, user_post_message)) as replies:
+                    async for message in replies:
+                        if not await append_posts(db, thread_ref, [{"author": "名無しさん", "message": message}]):
+                            break
+                        written_count += 1
+
+                # 1件も生成できなかった場合のみ固定の代替レスポンス
+                new_posts = [] if written_count else [
+                    {"author": "名無しさん", "message": message} for message in NANASHI_FALLBACK_MESSAGES
                 ]
             else:
+                # --- 名無しさんの処理（単一API呼び出し） ---
+                messages = await generate_nanashi_replies_single(thread_title, thread_history, user_post_message)
+
+                # エラー時やレスポンスがない場合は固定の代替レスポンス
                 new_posts = [
-                    {"author": "名無しさん", "message": item.get('content', '...')} for item in parsed_responses
+                    {"author": "名無しさん", "message": message} for message in (messages or NANASHI_FALLBACK_MESSAGES)
                 ]
 
         # AIが何も生成しなかった場合は書き込まない
         if not new_posts:
             return # finallyは実行される
-        
-        snapshot = await thread_ref.get()
-        if not snapshot.exists:
-            return
 
-        thread_data = snapshot.to_dict()
-        current_post_count = len(thread_data.get("posts", []))
-        
-        # 最終的な書き込みデータを作成（post_idなどを付与）
-        final_posts_data = []
-        for i, post_content in enumerate(new_posts):
-            final_post = {
-                "post_id": current_post_count + i + 1,
-                "author": post_content["author"],
-                "message": post_content["message"],
-                "created_at": datetime.now()
-            }
-            final_posts_data.append(final_post)
-        
-        # 1回のupdateで全ての投稿をまとめて追加
-        await thread_ref.update({
-            "posts": firestore.ArrayUnion(final_posts_data),
-            "updated_at": firestore.SERVER_TIMESTAMP
-        })
+        await append_posts(db, thread_ref, new_posts)
 
     except Exception as e:
         print(f"AIレスポンス生成中にエラーが発生しました: {e}")
@@ -193,21 +182,12 @@ async def create_post_in_thread(thread_id: str, post_data: CreatePostRequest, ba
         
         thread_data = doc.to_dict()
         thread_title = thread_data.get("title", "") # バックグラウンドタスク用にタイトルを取得
-        new_post_id = len(thread_data.get("posts", [])) + 1
         
-        # Pydanticモデルなどを使って新しい投稿データを作成
-        new_post = ThreadPost(
-            post_id=new_post_id,
-            author="イッチ",
-            message=post_data.message,
-            created_at=datetime.now()
-        )
-            
-        # トランザクションオブジェクトを使ってドキュメントを更新
-        await doc_ref.update({
-            "posts": firestore.ArrayUnion([new_post.model_dump()]),
-            "updated_at": firestore.SERVER_TIMESTAMP # サーバー時刻の使用を推奨
-        })
+        # トランザクションでpost_idを採番してドキュメントを更新
+        written_posts = await append_posts(db, doc_ref, [{"author": "イッチ", "message": post_data.message}])
+        if not written_posts:
+            raise HTTPException(status_code=404, detail="Thread not found")
+        new_post = ThreadPost(**written_posts[0])
 
         # バックグラウンドでAIレスポンスを生成
         background_tasks.add_task(generate_ai_responses, thread_id, post_data.message, thread_title)
@@ -254,9 +234,20 @@ async def delete_thread(thread_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/api/threads/{thread_id}/posts", response_model=List[ThreadPost])
-async def get_posts_in_thread(thread_id: str, since: Optional[int] = None):
-    # ... (変更なし)
+@router.get("/api/threads/{thread_id}/posts", response_model=Union[List[ThreadPost], ThreadPostPage])
+async def get_posts_in_thread(
+    thread_id: str,
+    since: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_POSTS_PAGE_SIZE),
+    before: Optional[int] = None,
+):
+    """
+    スレッドの投稿を取得する。
+    - since: 指定したpost_idより新しい投稿のみを返す（ポーリングの差分取得用）
+    - before: 指定したpost_idより古い投稿のみを返す（limitの有無に関わらず適用する）
+    - limit: 指定した場合は最新limit件（beforeがあればそれより古いlimit件）と、過去ページ用カーソルを返す。
+             sinceと併用した場合はsinceの直後からlimit件と、次のページ用カーソルを返す
+    """
     try:
         doc_ref = db.collection("threads").document(thread_id)
         doc = await doc_ref.get()
@@ -271,8 +262,27 @@ async def get_posts_in_thread(thread_id: str, since: Optional[int] = None):
         else:
             # sinceがなければ全件取得（既存の動作）
             sorted_posts = sorted(thread.posts, key=lambda p: p.post_id)
-            
-        return sorted_posts
+
+        if before is not None:
+            # 'before' より古い投稿のみをフィルタリング
+            sorted_posts = [p for p in sorted_posts if p.post_id < before]
+
+        if limit is None:
+            return sorted_posts
+
+        if since is not None:
+            # since がある場合は since の直後から古い順に limit 件を返す（末尾方向へのページング）
+            page = sorted_posts[:limit]
+            has_newer = len(sorted_posts) > len(page)
+            next_since = page[-1].post_id if page and has_newer else None
+            return ThreadPostPage(posts=page, next_since=next_since)
+
+        # ページングモード: 新しい方から limit 件を返す
+        page = sorted_posts[-limit:]
+        has_older = len(sorted_posts) > len(page)
+        next_before = page[0].post_id if page and has_older else None
+
+        return ThreadPostPage(posts=page, next_before=next_before)
     except HTTPException as e:
         raise e
     except Exception as e:
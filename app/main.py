@@ -1,6 +1,5 @@
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse, HTMLResponse, FileResponse
+from fastapi.responses import RedirectResponse, HTMLResponse
 from starlette.middleware.sessions import SessionMiddleware
 from google.oauth2 import id_token
 from google_auth_oauthlib.flow import Flow
@@ -9,6 +8,7 @@ import uvicorn
 import os
 
 from controller import router
+from static_assets import mount_static_files, index_response
 
 # --- アプリケーション設定 ---
 app = FastAPI(title="Habit App")
@@ -44,7 +44,7 @@ flow = Flow.from_client_config(
 app.include_router(router)
 
 # 静的ファイルの配信
-app.mount("/static", StaticFiles(directory="static"), name="static")
+mount_static_files(app)
 
 # ルートパスでindex.htmlを返す
 @app.get("/", include_in_schema=False, name="index")
@@ -56,7 +56,7 @@ async def read_index(request: Request):
     if not user_info:
         return RedirectResponse(url=request.url_for('login'))
 
-    return FileResponse('static/index.html')
+    return index_response(request)
 
 @app.get("/login", name="login")
 async def login(request: Request):
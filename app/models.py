@@ -40,4 +40,12 @@ class ThreadStatus(BaseModel):
     スレッドの状態（ポーリング用）
     """
     is_generating: bool = Field(..., description="AIレスポンス生成中フラグ")
-    post_count: int = Field(..., description="現在の投稿数")
\ No newline at end of file
+    post_count: int = Field(..., description="現在の投稿数")
+
+class ThreadPostPage(BaseModel):
+    """
+    投稿取得APIのページングレスポンス（N件 + 前後のページ用カーソル）
+    """
+    posts: List[ThreadPost] = Field(..., description="投稿のリスト（post_id昇順）")
+    next_before: Optional[int] = Field(None, description="さらに古い投稿を取得するためのカーソル（beforeに指定する）。古い投稿がなければNone")
+    next_since: Optional[int] = Field(None, description="さらに新しい投稿を取得するためのカーソル（sinceに指定する）。sinceでページングしていない場合や新しい投稿がなければNone")
\ No newline at end of file
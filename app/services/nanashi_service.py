@@ -0,0 +1,127 @@
+import os
+import random
+import asyncio
+from datetime import datetime
+
+from services.gemini_service import geminiApiCaller
+from services.prompt import NANASHI_MULTI_PROMPT, NANASHI_MULTI_SYSTEM_INSTRUCTION, NANASHI_PERSONAS, NANASHI_PERSONA_PROMPT
+from services.json_schema import NANASHI_MULTI_RESPONSE_SCHEMA
+
+# 名無しさんの生成モード
+#   single:   全ペルソナ分を1回のAPI呼び出しでまとめて生成する（デフォルト）
+#   parallel: ペルソナごとに軽量モデルを並列に呼び出し、生成できたものから書き込む
+NANASHI_GENERATION_MODES = ("single", "parallel")
+NANASHI_GENERATION_MODE = os.getenv("NANASHI_GENERATION_MODE", "single")
+if NANASHI_GENERATION_MODE not in NANASHI_GENERATION_MODES:
+    raise ValueError(f"NANASHI_GENERATION_MODE は {NANASHI_GENERATION_MODES} のいずれかを指定してください: {NANASHI_GENERATION_MODE!r}")
+NANASHI_NUM_RESPONSES = int(os.getenv("NANASHI_NUM_RESPONSES", "3"))
+if NANASHI_NUM_RESPONSES < 1:
+    raise ValueError(f"NANASHI_NUM_RESPONSES は1以上を指定してください: {NANASHI_NUM_RESPONSES}")
+# parallel モードで1ペルソナの生成を待つ最大秒数。超えたペルソナのレスは捨てる
+NANASHI_PERSONA_TIMEOUT_SEC = float(os.getenv("NANASHI_PERSONA_TIMEOUT_SEC", "8"))
+
+# エラー時やレスポンスがない場合の固定の代替レスポンス
+NANASHI_FALLBACK_MESSAGES = ["せやな", "草", "なるほど"]
+
+
+def build_thread_history(posts, user_post_message):
+    """
+    投稿のリストからプロンプト用のスレッド履歴を作成する
+    """
+    if not posts:
+        # 履歴が取得できない場合は、現在の投稿を履歴とする
+        # この場合、正確な時間は不明なため含めない
+        return f"イッチ: {user_post_message}"
+
+    thread_history_lines = []
+    for post in sorted(posts, key=lambda p: p.get('post_id', 0)):
+        created_at = post.get('created_at')
+        time_str = ""
+        # Firestoreから取得したタイムスタンプはdatetimeオブジェクトの場合と、文字列の場合があるため両対応
+        if isinstance(created_at, datetime):
+            time_str = created_at.strftime('%Y-%m-%d %H:%M:%S')
+        elif isinstance(created_at, str):
+            # ISOフォーマットの文字列をパースする想定
+            try:
+                time_str = datetime.fromisoformat(created_at).strftime('%Y-%m-%d %H:%M:%S')
+            except ValueError:
+                time_str = created_at # パース失敗時は元の文字列をそのまま利用
+
+        author = post.get('author', '不明')
+        message = post.get('message', '')
+        thread_history_lines.append(f"{author} ({time_str}): {message}")
+    return "\n".join(thread_history_lines)
+
+
+async def generate_nanashi_replies_single(thread_title, thread_history, user_post_message, num_responses=NANASHI_NUM_RESPONSES):
+    """
+    全ペルソナ分のレスを1回のAPI呼び出しで生成する。失敗時はNoneを返す
+    """
+    caller = geminiApiCaller(model_name="gemini-2.5-flash", response_schema=NANASHI_MULTI_RESPONSE_SCHEMA, thinking_budget=-1)
+
+    prompt = NANASHI_MULTI_PROMPT.format(
+        num_replies=num_responses,
+        thread_title=thread_title,
+        thread_history=thread_history, # 本来は完全な履歴
+        latest_post_content=user_post_message
+    )
+    # システムインストラクションをプロンプトに含める
+    full_prompt = f"{NANASHI_MULTI_SYSTEM_INSTRUCTION.format(num_replies=num_responses)}\n\n{prompt}"
+
+    parsed_responses, error = await caller.atext2text(full_prompt)
+
+    if error or not parsed_responses:
+        return None
+    return [item.get('content', '...') for item in parsed_responses]
+
+
+def pick_personas(num_responses):
+    """
+    レスを付けるペルソナを選ぶ。ペルソナ数より多く要求された場合は重複を許す
+    """
+    if num_responses <= len(NANASHI_PERSONAS):
+        return random.sample(NANASHI_PERSONAS, num_responses)
+    return random.choices(NANASHI_PERSONAS, k=num_responses)
+
+
+async def _generate_persona_reply(persona, thread_title, thread_history, user_post_message, timeout):
+    """
+    1ペルソナ分のレスを生成する。失敗・タイムアウト時はNoneを返す
+    """
+    caller = geminiApiCaller(model_name="gemini-2.5-flash-lite", thinking_budget=0)
+    prompt = NANASHI_PERSONA_PROMPT.format(
+        persona=persona,
+        thread_title=thread_title,
+        thread_history=thread_history,
+        latest_post_content=user_post_message
+    )
+
+    try:
+        message, error = await asyncio.wait_for(caller.atext2text(prompt), timeout=timeout)
+    except asyncio.TimeoutError:
+        print(f"名無しさんの生成がタイムアウトしました（{timeout}秒）: {persona}")
+        return None
+
+    if error or not message or not message.strip():
+        return None
+    return message.strip()
+
+
+async def iter_nanashi_replies_parallel(thread_title, thread_history, user_post_message, num_responses=NANASHI_NUM_RESPONSES, timeout=NANASHI_PERSONA_TIMEOUT_SEC):
+    """
+    ペルソナごとにレスを並列生成し、生成できたものから順に返す（async generator）。
+    失敗・タイムアウトしたペルソナのレスは個別に捨てる
+    """
+    tasks = [
+        asyncio.create_task(_generate_persona_reply(persona, thread_title, thread_history, user_post_message, timeout))
+        for persona in pick_personas(num_responses)
+    ]
+    try:
+        for next_reply in asyncio.as_completed(tasks):
+            message = await next_reply
+            if message:
+                yield message
+    finally:
+        # 呼び出し側が途中で打ち切った場合も残りの呼び出しを止める
+        for task in tasks:
+            task.cancel()
@@ -11,9 +11,31 @@ document.addEventListener('DOMContentLoaded', () => {
     const createPostForm = document.getElementById('create-post-form');
     const currentThreadIdInput = document.getElementById('current-thread-id');
     const aiGeneratingNotice = document.getElementById('ai-generating-notice');
+    const loadOlderPosts = document.getElementById('load-older-posts');
+    const loadNewerPosts = document.getElementById('load-newer-posts');
 
     let pollingInterval = null;
 
+    // --- 投稿表示ウィンドウ ---
+    const POSTS_PAGE_SIZE = 50; // 1回に取得する投稿数
+    const MAX_RENDERED_POSTS = 300; // DOMに保持する投稿数の上限
+    let lastPostId = 0; // 表示中の末尾のpost_id（差分取得のカーソル）
+    let hasOlder = false; // 表示中の先頭より古い投稿があるか
+    let hasNewer = false; // 表示中の末尾より新しい投稿があるか（末尾を削除した場合）
+    let isInitialLoading = false;
+    let isLoadingOlder = false;
+    let isLoadingNewer = false;
+    let windowToken = 0; // 表示を作り直すたびに増やし、古いリクエストの結果を破棄する
+
+    // 先頭・末尾付近までスクロールしたら前後の投稿を自動で読み込む
+    const sentinelObserver = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            if (entry.target === loadOlderPosts) fetchOlderPosts();
+            if (entry.target === loadNewerPosts) fetchNewerPosts();
+        });
+    }, { rootMargin: '200px 0px' });
+
     // --- APIベースURL ---
     const API_BASE_URL = '/api';
 
@@ -97,12 +119,19 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     // 投稿一覧取得 (DEV-15)
+    // スレッドを開いた時は最新 POSTS_PAGE_SIZE 件のみ取得し、前後の投稿はスクロールに応じて遅延読み込みする
     const fetchPosts = async (threadId) => {
+        resetPostWindow();
+        const token = windowToken;
+        isInitialLoading = true;
         try {
-            const response = await fetch(`${API_BASE_URL}/threads/${threadId}/posts`);
+            const response = await fetch(`${API_BASE_URL}/threads/${threadId}/posts?limit=${POSTS_PAGE_SIZE}`);
             if (!response.ok) throw new Error('投稿の取得に失敗しました');
             const data = await response.json();
 
+            // 読み込み中に別スレッドへ移動・再読み込みしていたら破棄
+            if (token !== windowToken) return;
+
             // APIレスポンスが {posts: [...]} 形式か、 [...] 形式かを判定
             const posts = Array.isArray(data) ? data : data.posts;
 
@@ -111,39 +140,116 @@ document.addEventListener('DOMContentLoaded', () => {
                 renderPosts([]); // エラーでも画面をクリアするために空配列を渡す
                 return;
             }
+            hasOlder = !Array.isArray(data) && data.next_before !== null;
             renderPosts(posts);
         } catch (error) {
             console.error(error);
             alert(error.message);
+        } finally {
+            if (token === windowToken) {
+                isInitialLoading = false;
+                updateSentinels();
+            }
+        }
+    };
+
+    // 表示中の先頭より古い投稿を1ページ分取得して先頭に追加する
+    const fetchOlderPosts = async () => {
+        const threadId = currentThreadIdInput.value;
+        if (!hasOlder || isInitialLoading || isLoadingOlder || !threadId) return;
+
+        const token = windowToken;
+        const before = firstRenderedPostId();
+        isLoadingOlder = true;
+        updateSentinels();
+        try {
+            const response = await fetch(`${API_BASE_URL}/threads/${threadId}/posts?limit=${POSTS_PAGE_SIZE}&before=${before}`);
+            if (!response.ok) throw new Error('過去の投稿の取得に失敗しました');
+            const page = await response.json();
+
+            // 読み込み中に表示範囲が変わっていたら（別スレッドへの移動や先頭の削除）間が空くので破棄
+            if (token !== windowToken || before !== firstRenderedPostId()) return;
+
+            prependPosts(page.posts);
+            hasOlder = page.next_before !== null;
+        } catch (error) {
+            console.error(error);
+        } finally {
+            isLoadingOlder = false;
+            if (token === windowToken) updateSentinels();
+        }
+    };
+
+    // 表示中の末尾より新しい投稿を1ページ分取得して末尾に追加する（末尾を削除した後の再読み込み用）
+    const fetchNewerPosts = async () => {
+        const threadId = currentThreadIdInput.value;
+        if (!hasNewer || isInitialLoading || isLoadingNewer || !threadId) return;
+
+        const token = windowToken;
+        const since = lastPostId;
+        isLoadingNewer = true;
+        updateSentinels();
+        try {
+            const response = await fetch(`${API_BASE_URL}/threads/${threadId}/posts?limit=${POSTS_PAGE_SIZE}&since=${since}`);
+            if (!response.ok) throw new Error('新しい投稿の取得に失敗しました');
+            const page = await response.json();
+
+            if (token !== windowToken || since !== lastPostId) return;
+
+            hasNewer = page.next_since !== null;
+            appendPosts(page.posts, { scroll: 'none' });
+        } catch (error) {
+            console.error(error);
+        } finally {
+            isLoadingNewer = false;
+            if (token === windowToken) updateSentinels();
         }
     };
     
     const renderPosts = (posts) => {
         chatPosts.innerHTML = '';
+        lastPostId = 0;
         if (!posts || posts.length === 0) return;
 
         appendPosts(posts, { scroll: 'auto' }); // 初期ロードは即時スクロール
     };
 
+    const createPostElement = (post) => {
+        const postElement = document.createElement('div');
+        postElement.className = 'post';
+        postElement.id = `post-${post.post_id}`;
+        postElement.innerHTML = `
+            <div class="post-header">${post.post_id}: <span class="author">${post.author}</span> <span class="date">${new Date(post.created_at).toLocaleString()}</span></div>
+            <div class="post-message">${convertAnchors(escapeHTML(post.message))}</div>
+        `;
+        return postElement;
+    };
+
+    const postIdOf = (element) => parseInt(element.id.replace('post-', ''));
+
+    const firstRenderedPostId = () => {
+        const firstPost = chatPosts.firstElementChild;
+        return firstPost ? postIdOf(firstPost) : lastPostId + 1;
+    };
+
     // 新しい投稿をDOMに追加する関数
     const appendPosts = (posts, options = {}) => {
         if (!posts || posts.length === 0) return;
 
         const scrollBehavior = options.scroll || 'smooth'; // デフォルトはスムーズスクロール
 
+        const fragment = document.createDocumentFragment();
         posts.forEach(post => {
-            const postElement = document.createElement('div');
-            postElement.className = 'post';
-            postElement.id = `post-${post.post_id}`;
-            postElement.innerHTML = `
-                <div class="post-header">${post.post_id}: <span class="author">${post.author}</span> <span class="date">${new Date(post.created_at).toLocaleString()}</span></div>
-                <div class="post-message">${convertAnchors(escapeHTML(post.message))}</div>
-            `;
-            chatPosts.appendChild(postElement);
+            // 差分取得が重複しても同じ投稿を二重に表示しない
+            if (post.post_id <= lastPostId) return;
+            fragment.appendChild(createPostElement(post));
+            lastPostId = post.post_id;
         });
+        chatPosts.appendChild(fragment);
+        trimOldestPosts();
 
         const lastPost = chatPosts.lastElementChild;
-        if (lastPost) {
+        if (lastPost && scrollBehavior !== 'none') {
             if (scrollBehavior === 'auto') {
                 lastPost.scrollIntoView();
             } else {
@@ -152,15 +258,132 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     };
 
+    // 過去の投稿をDOMの先頭に追加する関数（表示位置は維持する）
+    const prependPosts = (posts) => {
+        if (!posts || posts.length === 0) return;
+
+        // 表示中の先頭以降の投稿は重複になるので除外する
+        const firstPostId = firstRenderedPostId();
+        const fragment = document.createDocumentFragment();
+        posts.forEach(post => {
+            if (post.post_id >= firstPostId) return;
+            fragment.appendChild(createPostElement(post));
+        });
+
+        const previousHeight = document.documentElement.scrollHeight;
+        chatPosts.insertBefore(fragment, chatPosts.firstElementChild);
+        window.scrollBy(0, document.documentElement.scrollHeight - previousHeight);
+        trimNewestPosts();
+    };
+
+    // 描画中の投稿数が上限を超えたら古い方から取り除き、再度スクロールで読み込めるようにする
+    const trimOldestPosts = () => {
+        const overflow = chatPosts.children.length - MAX_RENDERED_POSTS;
+        if (overflow <= 0) return;
+
+        // 先頭を削除しても表示位置がずれないように補正する
+        const previousHeight = document.documentElement.scrollHeight;
+        for (let i = 0; i < overflow; i++) {
+            chatPosts.firstElementChild.remove();
+        }
+        window.scrollBy(0, document.documentElement.scrollHeight - previousHeight);
+        hasOlder = true;
+        updateSentinels();
+    };
+
+    // 過去の投稿を読み込んで上限を超えたら新しい方から取り除き、差分取得のカーソルも合わせて戻す
+    const trimNewestPosts = () => {
+        const overflow = chatPosts.children.length - MAX_RENDERED_POSTS;
+        if (overflow <= 0) return;
+
+        for (let i = 0; i < overflow; i++) {
+            chatPosts.lastElementChild.remove();
+        }
+        lastPostId = postIdOf(chatPosts.lastElementChild);
+        hasNewer = true;
+        updateSentinels();
+    };
+
+    const resetPostWindow = () => {
+        windowToken++;
+        chatPosts.innerHTML = '';
+        lastPostId = 0;
+        hasOlder = false;
+        hasNewer = false;
+        isLoadingOlder = false;
+        isLoadingNewer = false;
+        updateSentinels();
+    };
+
+    const updateSentinels = () => {
+        loadOlderPosts.classList.toggle('hidden', !hasOlder);
+        loadOlderPosts.textContent = isLoadingOlder ? '読み込み中...' : '過去のレスを読み込む';
+        loadNewerPosts.classList.toggle('hidden', !hasNewer);
+        loadNewerPosts.textContent = isLoadingNewer ? '読み込み中...' : '新しいレスを読み込む';
+
+        // IntersectionObserverは交差状態が変わった時しか通知しないため、
+        // 読み込み後もセンチネルが見えたままなら続けて読み込めるよう監視し直す
+        [loadOlderPosts, loadNewerPosts].forEach(sentinel => {
+            sentinelObserver.unobserve(sentinel);
+            sentinelObserver.observe(sentinel);
+        });
+    };
+
+    // 指定した投稿の周辺（その投稿以前の1ページと、それより後の1ページ）を表示し直す（アンカーでの移動用）
+    const loadPostsAround = async (threadId, postId) => {
+        resetPostWindow();
+        const token = windowToken;
+        isInitialLoading = true;
+        try {
+            const olderResponse = await fetch(`${API_BASE_URL}/threads/${threadId}/posts?limit=${POSTS_PAGE_SIZE}&before=${postId + 1}`);
+            if (!olderResponse.ok) throw new Error('投稿の取得に失敗しました');
+            const olderPage = await olderResponse.json();
+            if (token !== windowToken) return;
+
+            hasOlder = olderPage.next_before !== null;
+            appendPosts(olderPage.posts, { scroll: 'none' });
+
+            const newerResponse = await fetch(`${API_BASE_URL}/threads/${threadId}/posts?limit=${POSTS_PAGE_SIZE}&since=${lastPostId}`);
+            if (!newerResponse.ok) throw new Error('投稿の取得に失敗しました');
+            const newerPage = await newerResponse.json();
+            if (token !== windowToken) return;
+
+            hasNewer = newerPage.next_since !== null;
+            appendPosts(newerPage.posts, { scroll: 'none' });
+
+            const targetPost = document.getElementById(`post-${postId}`);
+            if (targetPost) highlightPost(targetPost);
+        } catch (error) {
+            console.error(error);
+            alert(error.message);
+        } finally {
+            if (token === windowToken) {
+                isInitialLoading = false;
+                updateSentinels();
+            }
+        }
+    };
+
+    // 投稿までスクロールしてハイライトする
+    const highlightPost = (targetPost) => {
+        targetPost.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        targetPost.classList.add('post-highlight');
+        setTimeout(() => {
+            targetPost.classList.remove('post-highlight');
+        }, 1500); // 1.5秒後にハイライトを消す
+    };
+
     // 新しい投稿のみを取得する関数
     const fetchNewPosts = async (threadId) => {
-        const lastPostElement = chatPosts.lastElementChild;
-        const lastPostId = lastPostElement ? parseInt(lastPostElement.id.replace('post-', '')) : 0;
+        // 初回読み込み中や、末尾を削除して最新まで表示していない間は差分取得しない
+        if (isInitialLoading || hasNewer) return;
 
+        const token = windowToken;
         try {
             const response = await fetch(`${API_BASE_URL}/threads/${threadId}/posts?since=${lastPostId}`);
             if (!response.ok) throw new Error('新しい投稿の取得に失敗しました');
             const newPosts = await response.json();
+            if (token !== windowToken || hasNewer) return;
             appendPosts(newPosts);
         } catch (error) {
             console.error(error);
@@ -182,7 +405,11 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!response.ok) throw new Error('投稿に失敗しました');
             
             document.getElementById('post-message').value = '';
-            await fetchNewPosts(threadId); // 自分の投稿も差分取得で反映
+            if (hasNewer) {
+                await fetchPosts(threadId); // 過去ログ表示中なら最新ページを開き直して自分の投稿を表示
+            } else {
+                await fetchNewPosts(threadId); // 自分の投稿も差分取得で反映
+            }
             startPolling(threadId); // AIのレスを待つためにポーリング開始
         } catch (error) {
             console.error(error);
@@ -226,13 +453,17 @@ document.addEventListener('DOMContentLoaded', () => {
 
             if (status.is_generating) {
                 aiGeneratingNotice.classList.remove('hidden');
+
+                // 生成途中でも書き込み済みのレスがあれば順次表示する
+                if (status.post_count > lastPostId) {
+                    fetchNewPosts(threadId);
+                }
             } else {
                 aiGeneratingNotice.classList.add('hidden');
                 stopPolling(); // 生成が完了したのでポーリングを停止
 
                 // 投稿数が増えていれば、新しい投稿のみを取得
-                const currentPostCount = chatPosts.children.length;
-                if (status.post_count > currentPostCount) {
+                if (status.post_count > lastPostId) {
                     fetchNewPosts(threadId);
                 }
             }
@@ -259,6 +490,9 @@ document.addEventListener('DOMContentLoaded', () => {
     // --- イベントリスナー ---
     backToThreadsButton.addEventListener('click', showThreadList);
 
+    loadOlderPosts.addEventListener('click', fetchOlderPosts);
+    loadNewerPosts.addEventListener('click', fetchNewerPosts);
+
     threadList.addEventListener('click', (e) => {
         e.preventDefault();
         
@@ -279,15 +513,13 @@ document.addEventListener('DOMContentLoaded', () => {
         const anchor = e.target.closest('.anchor-link');
         if (anchor) {
             e.preventDefault();
-            const postId = anchor.dataset.postId;
+            const postId = parseInt(anchor.dataset.postId);
             const targetPost = document.getElementById(`post-${postId}`);
             if (targetPost) {
-                // スクロールしてハイライト
-                targetPost.scrollIntoView({ behavior: 'smooth', block: 'center' });
-                targetPost.classList.add('post-highlight');
-                setTimeout(() => {
-                    targetPost.classList.remove('post-highlight');
-                }, 1500); // 1.5秒後にハイライトを消す
+                highlightPost(targetPost);
+            } else if (postId > 0) {
+                // 表示範囲外の投稿なら、その投稿の周辺を読み込み直してから移動する
+                loadPostsAround(currentThreadIdInput.value, postId);
             }
         }
     });
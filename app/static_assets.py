@@ -0,0 +1,130 @@
+import os
+from mimetypes import guess_type
+
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse
+
+from build_static import ASSETS, BUILD_DIR, DIST_DIR, HASHED_NAME_PATTERN, INDEX_HTML, STATIC_DIR
+
+# ハッシュ付きアセットは内容が変わればURLも変わるため、1年間・変更なしとしてキャッシュさせる
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# ハッシュを含まないファイル名と index.html は毎回サーバーに再検証させる（変更がなければ304）
+REVALIDATE_CACHE_CONTROL = "no-cache"
+INDEX_CACHE_CONTROL = "private, no-cache"
+
+# 優先度の高い順に並べた、事前圧縮ファイルのエンコーディングと拡張子
+PRECOMPRESSED_ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+# 条件付きリクエストの判定（Starletteの実装）を使うためのインスタンス
+_conditional = StaticFiles(check_dir=False)
+
+
+def is_not_modified(response_headers, request_headers: Headers):
+    """
+    If-None-Match / If-Modified-Since から304を返せるか判定する。
+    Starletteの判定に加えて、If-None-Match: * にも対応する
+    """
+    if request_headers.get("if-none-match", "").strip() == "*":
+        return True
+    return _conditional.is_not_modified(response_headers, request_headers)
+
+
+def accepted_encodings(request_headers: Headers):
+    """
+    Accept-Encodingヘッダーから、クライアントが受け付けるエンコーディングの集合を返す
+    """
+    encodings = set()
+    for item in request_headers.get("accept-encoding", "").split(","):
+        encoding, _, params = item.strip().partition(";")
+        # "br;q=0" のように明示的に拒否されたものは除外する
+        _, _, quality = params.strip().partition("q=")
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        if encoding:
+            encodings.add(encoding.strip().lower())
+    return encodings
+
+
+class HashedStaticFiles(StaticFiles):
+    """
+    build_static.py が生成したハッシュ付きアセットを配信するStaticFiles。
+    事前圧縮ファイル（.br / .gz）があればそちらを返し、ハッシュ付きのファイル名にだけimmutableなキャッシュヘッダーを付与する
+    """
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        encodings = accepted_encodings(request_headers)
+        media_type = guess_type(str(full_path))[0] or "text/plain"
+
+        response = None
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            compressed_path = f"{full_path}{suffix}"
+            if encoding in encodings and os.path.isfile(compressed_path):
+                response = FileResponse(
+                    compressed_path,
+                    status_code=status_code,
+                    stat_result=os.stat(compressed_path),
+                    media_type=media_type,
+                    headers={"content-encoding": encoding},
+                )
+                break
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+
+        if HASHED_NAME_PATTERN.match(os.path.basename(str(full_path))):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["cache-control"] = REVALIDATE_CACHE_CONTROL
+        response.headers["vary"] = "Accept-Encoding"
+
+        if is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def mount_static_files(app: FastAPI, static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """
+    静的ファイルの配信を登録する。
+    ハッシュ付きアセット（build_static.pyで生成）は事前圧縮版を長期キャッシュ付きで配信する
+    """
+    # 未ビルド（開発環境など）でも /static/dist/ へのリクエストが500ではなく404になるよう、ディレクトリは作っておく
+    os.makedirs(dist_dir, exist_ok=True)
+    app.mount("/static/dist", HashedStaticFiles(directory=dist_dir), name="static-dist")
+    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+
+
+def is_build_current(static_dir=STATIC_DIR, build_dir=BUILD_DIR):
+    """
+    ビルド済みのindex.htmlが、元のindex.htmlやアセットより新しいかどうかを返す。
+    ビルド後にソースを編集した場合（開発環境など）は古いビルドを使わないようにする
+    """
+    built_index = os.path.join(build_dir, INDEX_HTML)
+    if not os.path.isfile(built_index):
+        return False
+
+    built_mtime = os.path.getmtime(built_index)
+    sources = [INDEX_HTML, *ASSETS]
+    return all(os.path.getmtime(os.path.join(static_dir, name)) <= built_mtime for name in sources)
+
+
+def index_response(request: Request, static_dir=STATIC_DIR, build_dir=BUILD_DIR):
+    """
+    index.htmlを返す。最新のビルド済み（ハッシュ付きURLに書き換え済み）のものがあればそれを優先し、
+    ETagによる再検証で変更がなければ304を返す
+    """
+    if is_build_current(static_dir, build_dir):
+        path = os.path.join(build_dir, INDEX_HTML)
+    else:
+        path = os.path.join(static_dir, INDEX_HTML)
+
+    response = FileResponse(path, stat_result=os.stat(path), headers={"cache-control": INDEX_CACHE_CONTROL})
+
+    if is_not_modified(response.headers, request.headers):
+        return NotModifiedResponse(response.headers)
+    return response
@@ -0,0 +1,104 @@
+"""
+名無しさんのレス生成モードのベンチマーク
+
+single（1回のAPI呼び出しで全ペルソナ分を生成）と parallel（ペルソナごとに並列呼び出し）を、
+同じ入力で複数回実行し、レイテンシと固定の代替レスポンスへのフォールバック率を比較する。
+Gemini API を実際に呼び出すため、GCP_PROJECT_ID / LOCATION などの環境変数が必要。Firestoreには書き込まない。
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/nanashi_generation_bench.py --runs 10 --num-responses 3 --timeout 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from services.nanashi_service import (  # noqa: E402
+    build_thread_history, generate_nanashi_replies_single, iter_nanashi_replies_parallel,
+)
+
+# ベンチマーク用の入力（スレッドタイトル, イッチの投稿）
+SAMPLE_POSTS = [
+    ("毎日コードを書くスレ", "今日はFastAPIのテストを3本書いたで"),
+    ("技術ブログを毎日読むスレ", "今日はサボってもうた…明日から本気出す"),
+    ("英語の勉強を続けるスレ", "単語アプリ30日連続達成したわ"),
+]
+
+
+def percentile(values, ratio):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_single(thread_title, user_post, num_responses, timeout):
+    thread_history = build_thread_history([], user_post)
+    start = time.perf_counter()
+    # parallel モードと同じ締め切りを1回の呼び出し全体に適用し、間に合わなければフォールバック扱いにする
+    try:
+        messages = await asyncio.wait_for(
+            generate_nanashi_replies_single(thread_title, thread_history, user_post, num_responses=num_responses),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        messages = None
+    elapsed = time.perf_counter() - start
+    # single は全件まとめて届くため、最初のレスと最後のレスの到着時刻は同じ
+    return {"first": elapsed, "last": elapsed, "replies": len(messages or []), "fallback": not messages}
+
+
+async def run_parallel(thread_title, user_post, num_responses, timeout):
+    thread_history = build_thread_history([], user_post)
+    start = time.perf_counter()
+    first = None
+    replies = 0
+    async for _ in iter_nanashi_replies_parallel(thread_title, thread_history, user_post, num_responses=num_responses, timeout=timeout):
+        if first is None:
+            first = time.perf_counter() - start
+        replies += 1
+    elapsed = time.perf_counter() - start
+    return {"first": first if first is not None else elapsed, "last": elapsed, "replies": replies, "fallback": replies == 0}
+
+
+async def benchmark(mode, runner, runs, num_responses, timeout):
+    results = []
+    for i in range(runs):
+        thread_title, user_post = SAMPLE_POSTS[i % len(SAMPLE_POSTS)]
+        results.append(await runner(thread_title, user_post, num_responses, timeout))
+
+    firsts = [r["first"] for r in results]
+    lasts = [r["last"] for r in results]
+    fallback_rate = sum(r["fallback"] for r in results) / runs
+    # 要求した件数に対して届かなかったレスの割合（フォールバック分は届かなかった扱い）
+    drop_rate = 1 - sum(r["replies"] for r in results) / (runs * num_responses)
+
+    print(
+        f"{mode:<10}"
+        f"{statistics.median(firsts):>12.2f}{percentile(firsts, 0.95):>12.2f}"
+        f"{statistics.median(lasts):>12.2f}{percentile(lasts, 0.95):>12.2f}"
+        f"{fallback_rate:>12.0%}{drop_rate:>12.0%}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="名無しさんのレス生成モード（single / parallel）の比較")
+    parser.add_argument("--runs", type=int, default=10, help="モードごとの試行回数")
+    parser.add_argument("--num-responses", type=int, default=3, help="1回あたりに生成するレス数")
+    parser.add_argument("--timeout", type=float, default=8.0, help="締め切り（秒）。single は1回の呼び出し全体、parallel は1ペルソナあたりに適用する")
+    args = parser.parse_args()
+
+    print(f"runs={args.runs} num_responses={args.num_responses} timeout={args.timeout}s")
+    print(f"{'mode':<10}{'first_p50':>12}{'first_p95':>12}{'all_p50':>12}{'all_p95':>12}{'fallback':>12}{'dropped':>12}")
+    await benchmark("single", run_single, args.runs, args.num_responses, args.timeout)
+    await benchmark("parallel", run_parallel, args.runs, args.num_responses, args.timeout)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+ページロード時の転送量・リクエスト数のベンチマーク
+
+main.py と同じ静的ファイル配信（mount_static_files / index_response）を持つアプリに TestClient でリクエストし、
+静的ファイルのビルド（build_static.py）前後で、チャット画面を開くときのリクエスト数とレスポンスボディのバイト数を実測する。
+（Google認証のセッションチェックは除いている）
+
+- cold: キャッシュが空の状態で index.html と参照されているアセットを取得する
+- warm: 直前のレスポンスをキャッシュした状態でもう一度開く。Cache-Control の max-age が有効なものはリクエストせず、
+        それ以外は ETag / Last-Modified を使った条件付きリクエストで再検証する（ブラウザのヒューリスティックキャッシュは考慮しない）
+
+使い方（リポジトリのルートで実行）:
+    python benchmarks/page_load_bench.py
+"""
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from build_static import ASSET_REFERENCE_PATTERN, STATIC_DIR, build  # noqa: E402
+from static_assets import index_response, mount_static_files  # noqa: E402
+
+ACCEPT_ENCODING = "gzip, br"
+
+
+def create_app(static_dir, dist_dir, build_dir):
+    """
+    main.py と同じ静的ファイル配信を行うアプリを作成する
+    """
+    app = FastAPI()
+    mount_static_files(app, static_dir=static_dir, dist_dir=dist_dir)
+
+    @app.get("/")
+    async def read_index(request: Request):
+        return index_response(request, static_dir=static_dir, build_dir=build_dir)
+
+    return app
+
+
+def max_age(cache_control):
+    """
+    Cache-Controlからキャッシュをそのまま使える秒数を返す（no-cacheなどの場合は0）
+    """
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else 0
+
+
+class Browser:
+    """
+    レスポンスをキャッシュし、リクエスト数と受信したボディのバイト数を数える簡易ブラウザ
+    """
+    def __init__(self, client):
+        self.client = client
+        self.cache = {}
+
+    def get(self, url, stats):
+        cached = self.cache.get(url)
+        if cached and max_age(cached["headers"].get("cache-control", "")) > 0:
+            return cached["body"]
+
+        headers = {"accept-encoding": ACCEPT_ENCODING}
+        if cached:
+            if "etag" in cached["headers"]:
+                headers["if-none-match"] = cached["headers"]["etag"]
+            if "last-modified" in cached["headers"]:
+                headers["if-modified-since"] = cached["headers"]["last-modified"]
+
+        response = self.client.get(url, headers=headers)
+        stats["requests"] += 1
+        # num_bytes_downloaded は展開前（転送された）のボディのバイト数
+        stats["body_bytes"] += response.num_bytes_downloaded
+        stats["statuses"].append(response.status_code)
+
+        if response.status_code == 304 and cached:
+            return cached["body"]
+        response.raise_for_status()
+        self.cache[url] = {"headers": dict(response.headers), "body": response.text}
+        return response.text
+
+    def load_page(self):
+        stats = {"requests": 0, "body_bytes": 0, "statuses": []}
+        index_html = self.get("/", stats)
+        for _, path in ASSET_REFERENCE_PATTERN.findall(index_html):
+            self.get(f"/static/{path}", stats)
+        return stats
+
+
+def measure(label, static_dir, dist_dir, build_dir):
+    with TestClient(create_app(static_dir, dist_dir, build_dir)) as client:
+        browser = Browser(client)
+        return [(f"{label} (cold)", browser.load_page()), (f"{label} (warm)", browser.load_page())]
+
+
+def main():
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        static_dir = os.path.join(work_dir, "static")
+        dist_dir = os.path.join(static_dir, "dist")
+        build_dir = os.path.join(work_dir, "build")
+        shutil.copytree(STATIC_DIR, static_dir, ignore=shutil.ignore_patterns("dist"))
+
+        results += measure("unbuilt", static_dir, dist_dir, build_dir)
+        build(static_dir=static_dir, dist_dir=dist_dir, build_dir=build_dir)
+        results += measure("built", static_dir, dist_dir, build_dir)
+
+    print(f"{'scenario':<16}{'requests':>10}{'body_bytes':>12}  statuses")
+    for label, stats in results:
+        statuses = ",".join(str(status) for status in stats["statuses"]) or "-"
+        print(f"{label:<16}{stats['requests']:>10}{stats['body_bytes']:>12}  {statuses}")
+
+
+if __name__ == "__main__":
+    main()